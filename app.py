@@ -10,6 +10,11 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import os
 
+from data_store import SharedDataset, data_version
+from related import RELATED_ARTICLES_FILE, load_related_lookup
+from schema import CANONICAL_COLUMNS, iter_records, normalize_news_frame
+from trending import TRENDING_TOPICS_FILE, TRENDING_WINDOWS, article_key, load_topics
+
 # Page configuration
 st.set_page_config(
     page_title="FinSight - Financial Intelligence Dashboard",
@@ -51,31 +56,53 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=600)  # Cache for 10 minutes, then reload
-def load_news_data():
+CSV_PATH = 'finance_news.csv'
+
+@st.cache_resource(max_entries=2)  # One shared object per data version, not a copy per session
+def load_news_data(version):
     """Load financial news data from CSV with proper error handling"""
     try:
-        csv_path = 'finance_news.csv'
+        csv_path = CSV_PATH
         
         if not os.path.exists(csv_path):
             st.error(f"❌ Data file '{csv_path}' not found. Please run news_fetch.py first.")
-            return pd.DataFrame()
+            return SharedDataset(pd.DataFrame(columns=CANONICAL_COLUMNS), version)
         
-        df = pd.read_csv(csv_path)
+        # Map whatever columns the CSV has onto the canonical schema, once;
+        # issues are shown under "Schema notes" in the sidebar
+        df, report = normalize_news_frame(pd.read_csv(csv_path))
         
-        # Convert date columns if they exist
-        if 'date' in df.columns:
-            df['date'] = pd.to_datetime(df['date'], errors='coerce')
-        elif 'published' in df.columns:
-            df['date'] = pd.to_datetime(df['published'], errors='coerce')
-        elif 'timestamp' in df.columns:
-            df['date'] = pd.to_datetime(df['timestamp'], errors='coerce')
-        
-        return df
+        return SharedDataset(df, version, report)
     
     except Exception as e:
         st.error(f"❌ Error loading data: {str(e)}")
-        return pd.DataFrame()
+        return SharedDataset(pd.DataFrame(columns=CANONICAL_COLUMNS), version)
+
+@st.cache_resource(max_entries=2)
+def load_related_articles(version):
+    """Precomputed related-article lookup (built by news_fetch.py), shared by all sessions"""
+    return load_related_lookup(RELATED_ARTICLES_FILE)
+
+def build_news_cards(df, max_articles, related_lookup):
+    """Newest-first (record, metadata line, related links) for the news feed"""
+    cards = []
+    for record in iter_records(df.sort_values('date', ascending=False).head(max_articles)):
+        metadata_parts = []
+        if record.source:
+            metadata_parts.append(f"📡 {record.source}")
+        if record.category:
+            metadata_parts.append(f"📑 {record.category}")
+        if pd.notna(record.date):
+            metadata_parts.append(f"📅 {record.date.strftime('%Y-%m-%d %H:%M')}")
+        related = related_lookup.get(article_key(record._asdict()), [])
+        related_links = " · ".join(f"[{r['title'].replace('[', '(').replace(']', ')')}]({r['url']}) ({r['source']})" for r in related)
+        cards.append((record, " | ".join(metadata_parts), related_links))
+    return cards
+
+@st.cache_resource(max_entries=2)
+def load_trending_topics(version):
+    """Trending topics exported by news_fetch.py, shared by all sessions"""
+    return load_topics(TRENDING_TOPICS_FILE)
 
 def display_header():
     """Display dashboard header"""
@@ -83,52 +110,53 @@ def display_header():
     st.markdown('<p style="text-align: center; color: #666; font-size: 1.2rem;">Financial Intelligence Dashboard</p>', unsafe_allow_html=True)
     st.markdown("---")
 
-def display_metrics(df):
+def display_metrics(data):
     """Display key metrics"""
-    if df.empty:
+    if data.empty:
         return
     
+    df = data.df
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
         st.metric("📰 Total Articles", len(df))
     
     with col2:
-        if 'date' in df.columns:
+        if df['date'].notna().any():
             today = datetime.now().date()
-            today_count = len(df[df['date'].dt.date == today])
+            today_count = data.memo(f'today_count:{today}', lambda d: int((d['date'].dt.date == today).sum()))
             st.metric("📅 Today's News", today_count)
         else:
             st.metric("📅 Today's News", "N/A")
     
     with col3:
-        if 'category' in df.columns:
-            categories = df['category'].nunique()
-            st.metric("📑 Categories", categories)
-        elif 'source' in df.columns:
-            sources = df['source'].nunique()
-            st.metric("📡 Sources", sources)
+        group_col = data.schema.distribution_column if data.schema else None
+        if group_col:
+            group_count = data.memo(f'nunique:{group_col}', lambda d: d[group_col].replace('', pd.NA).nunique())
+            label = "📑 Categories" if group_col == 'category' else "📡 Sources"
+            st.metric(label, group_count)
         else:
             st.metric("📑 Categories", "N/A")
     
     with col4:
-        if 'date' in df.columns and not df['date'].isna().all():
-            last_update = df['date'].max()
+        if df['date'].notna().any():
+            last_update = data.memo('last_update', lambda d: d['date'].max())
             st.metric("🔄 Last Update", last_update.strftime("%Y-%m-%d %H:%M") if pd.notna(last_update) else "N/A")
         else:
             st.metric("🔄 Last Update", "N/A")
 
-def display_news_timeline(df):
+def display_news_timeline(data):
     """Display news timeline visualization"""
-    if df.empty or 'date' not in df.columns:
+    if data.empty or data.df['date'].isna().all():
         return
     
     st.subheader("📈 News Timeline")
     
-    # Group by date and count
-    df_copy = df.copy()
-    df_copy['date_only'] = df_copy['date'].dt.date
-    timeline_data = df_copy.groupby('date_only').size().reset_index(name='count')
+    # Group by date and count (once per data version, shared by all sessions)
+    timeline_data = data.memo(
+        'timeline',
+        lambda d: d.groupby(d['date'].dt.date.rename('date_only')).size().reset_index(name='count')
+    )
     
     fig = px.line(
         timeline_data, 
@@ -142,24 +170,20 @@ def display_news_timeline(df):
     
     st.plotly_chart(fig, use_container_width=True)
 
-def display_category_distribution(df):
+def display_category_distribution(data):
     """Display category distribution"""
-    if df.empty:
+    if data.empty:
         return
     
-    category_col = None
-    if 'category' in df.columns:
-        category_col = 'category'
-    elif 'source' in df.columns:
-        category_col = 'source'
-    elif 'topic' in df.columns:
-        category_col = 'topic'
+    category_col = data.schema.distribution_column if data.schema else None
     
     if category_col:
         st.subheader(f"📊 Distribution by {category_col.title()}")
         
-        category_counts = df[category_col].value_counts().reset_index()
-        category_counts.columns = [category_col, 'count']
+        category_counts = data.memo(
+            f'counts:{category_col}',
+            lambda d: d.loc[d[category_col] != '', category_col].value_counts().rename_axis(category_col).reset_index(name='count')
+        )
         
         fig = px.pie(
             category_counts, 
@@ -171,59 +195,87 @@ def display_category_distribution(df):
         
         st.plotly_chart(fig, use_container_width=True)
 
-def display_news_articles(df, max_articles=20):
+def display_trending_topics():
+    """Display topics spiking in the last N hours"""
+    st.subheader("🔥 Trending Topics")
+    
+    window_hours = st.select_slider(
+        "Spiking in the last",
+        options=TRENDING_WINDOWS,
+        value=24,
+        format_func=lambda h: f"{h} hours"
+    )
+    
+    exported = load_trending_topics(data_version(TRENDING_TOPICS_FILE))
+    if exported is None:
+        st.info("No trending data yet. Run news_fetch.py to build it.")
+        return
+    
+    topics = exported['windows'].get(str(window_hours), [])
+    updated = datetime.fromtimestamp(os.path.getmtime(TRENDING_TOPICS_FILE))
+    st.caption(f"As of the last news fetch ({updated.strftime('%Y-%m-%d %H:%M')})")
+    if not topics:
+        st.info(f"Nothing is spiking above baseline in the last {window_hours} hours.")
+        return
+    
+    trending_df = pd.DataFrame(topics).sort_values('score')
+    fig = px.bar(
+        trending_df,
+        x='score',
+        y='term',
+        orientation='h',
+        hover_data={'count': True, 'baseline': True},
+        title='Burst Score vs. Baseline',
+        labels={'score': 'Burst Score', 'term': 'Topic', 'count': 'Mentions', 'baseline': 'Baseline Mentions'}
+    )
+    fig.update_traces(marker_color='#ff7f0e')
+    
+    st.plotly_chart(fig, use_container_width=True)
+
+def display_news_articles(data, max_articles=20):
     """Display news articles as cards"""
-    if df.empty:
+    if data.empty:
         st.warning("⚠️ No news data available. The news fetching script will update this automatically every 4 hours.")
         return
     
     st.subheader("📰 Latest Financial News")
     
-    # Sort by date if available
-    if 'date' in df.columns:
-        df = df.sort_values('date', ascending=False)
+    # Cards are built once per data/index version; the loop below only renders
+    related_version = data_version(RELATED_ARTICLES_FILE)
+    related_lookup = load_related_articles(related_version)
+    cards = data.memo(
+        f'cards:{max_articles}:{related_version}',
+        lambda d: build_news_cards(d, max_articles, related_lookup)
+    )
     
     # Display articles
-    for idx, row in df.head(max_articles).iterrows():
+    for record, metadata, related_links in cards:
         with st.container():
             st.markdown('<div class="news-card">', unsafe_allow_html=True)
             
             # Title
-            title = row.get('title', 'No title')
-            st.markdown(f"### {title}")
+            st.markdown(f"### {record.title or 'No title'}")
             
             # Metadata
-            metadata_parts = []
-            if 'source' in row and pd.notna(row['source']):
-                metadata_parts.append(f"📡 {row['source']}")
-            if 'category' in row and pd.notna(row['category']):
-                metadata_parts.append(f"📑 {row['category']}")
-            if 'date' in row and pd.notna(row['date']):
-                metadata_parts.append(f"📅 {row['date'].strftime('%Y-%m-%d %H:%M')}")
-            
-            if metadata_parts:
-                st.markdown(" | ".join(metadata_parts))
+            if metadata:
+                st.markdown(metadata)
             
-            # Description/Summary
-            if 'description' in row and pd.notna(row['description']):
-                st.write(row['description'])
-            elif 'summary' in row and pd.notna(row['summary']):
-                st.write(row['summary'])
-            elif 'content' in row and pd.notna(row['content']):
-                # Show first 200 characters of content
-                content_preview = str(row['content'])[:200] + "..." if len(str(row['content'])) > 200 else str(row['content'])
-                st.write(content_preview)
+            # Description/Summary (already coalesced and truncated at load time)
+            if record.description:
+                st.write(record.description)
             
             # Link
-            if 'url' in row and pd.notna(row['url']):
-                st.markdown(f"[🔗 Read more]({row['url']})")
-            elif 'link' in row and pd.notna(row['link']):
-                st.markdown(f"[🔗 Read more]({row['link']})")
+            if record.url:
+                st.markdown(f"[🔗 Read more]({record.url})")
+            
+            # Other coverage of the same story
+            if related_links:
+                st.caption(f"🧩 Related: {related_links}")
             
             st.markdown('</div>', unsafe_allow_html=True)
             st.markdown("")
 
-def display_sidebar():
+def display_sidebar(schema=None):
     """Display sidebar with filters and info"""
     with st.sidebar:
         st.image("https://img.icons8.com/color/96/000000/graph.png", width=80)
@@ -242,36 +294,43 @@ def display_sidebar():
         st.markdown("---")
         st.markdown("### 🛠️ Settings")
         
-        # Reload data button
+        # Reload data button: shared caches are keyed by file version, so a
+        # rerun picks up new data without evicting it for every other session
         if st.button("🔄 Refresh Data", use_container_width=True):
-            st.cache_data.clear()
             st.rerun()
         
         st.markdown("---")
         st.markdown("### 📊 Data Info")
         
-        csv_path = 'finance_news.csv'
+        csv_path = CSV_PATH
         if os.path.exists(csv_path):
             file_modified = datetime.fromtimestamp(os.path.getmtime(csv_path))
             st.markdown(f"**Last file update:**  \n{file_modified.strftime('%Y-%m-%d %H:%M:%S')}")
         
+        if schema and (schema.issues or schema.ignored):
+            with st.expander(f"⚠️ Schema notes ({len(schema.issues)})"):
+                for issue in schema.issues:
+                    st.caption(issue)
+                if schema.ignored:
+                    st.caption(f"Ignored columns: {', '.join(schema.ignored)}")
+        
         st.markdown("---")
         st.caption("Built with ❤️ using Streamlit")
         st.caption("Deployed on Streamlit Cloud")
 
 def main():
     """Main application function"""
+    # Load data
+    data = load_news_data(data_version(CSV_PATH))
+    
     # Display sidebar
-    display_sidebar()
+    display_sidebar(data.schema)
     
     # Display header
     display_header()
     
-    # Load data
-    df = load_news_data()
-    
     # Display metrics
-    display_metrics(df)
+    display_metrics(data)
     
     st.markdown("---")
     
@@ -279,24 +338,26 @@ def main():
     tab1, tab2, tab3 = st.tabs(["📰 News Feed", "📊 Analytics", "📋 Data Table"])
     
     with tab1:
-        display_news_articles(df)
+        display_news_articles(data)
     
     with tab2:
         col1, col2 = st.columns(2)
         
         with col1:
-            display_news_timeline(df)
+            display_news_timeline(data)
         
         with col2:
-            display_category_distribution(df)
+            display_category_distribution(data)
+        
+        display_trending_topics()
     
     with tab3:
         st.subheader("📋 Raw Data")
-        if not df.empty:
-            st.dataframe(df, use_container_width=True)
+        if not data.empty:
+            st.dataframe(data.df, use_container_width=True)
             
-            # Download button
-            csv = df.to_csv(index=False)
+            # Download button (serialized once per data version)
+            csv = data.memo('csv_export', lambda d: d.to_csv(index=False))
             st.download_button(
                 label="📥 Download CSV",
                 data=csv,
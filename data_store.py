@@ -0,0 +1,95 @@
+"""
+Shared Dataset Store
+One read-only news dataset per data version, shared by every dashboard session
+"""
+
+import os
+import threading
+from typing import Any, Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+
+def data_version(path: str) -> str:
+    """
+    Cheap version key for a data file: changes whenever the file is rewritten
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return 'missing'
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Read-only copy of a DataFrame/Series, made once: numpy buffers are marked
+    non-writeable (Arrow-backed columns already are), so an in-place write
+    through any view raises instead of changing data other sessions see.
+    Other values are returned unchanged.
+    """
+    if isinstance(value, pd.Series):
+        return _freeze(value.to_frame()).iloc[:, 0]
+    if not isinstance(value, pd.DataFrame):
+        return value
+    columns = []
+    for i in range(value.shape[1]):
+        values = value.iloc[:, i].array.copy()
+        buffer = np.asarray(values)
+        while isinstance(buffer.base, np.ndarray):
+            buffer = buffer.base
+        if buffer.flags.owndata:
+            buffer.flags.writeable = False
+        columns.append(values)
+    frozen = pd.DataFrame(dict(enumerate(columns)), index=value.index, copy=False)
+    frozen.columns = value.columns
+    return frozen
+
+
+def _view(value: Any) -> Any:
+    """New DataFrame/Series object over the same frozen buffers"""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    return value
+
+
+class SharedDataset:
+    """
+    Immutable dataset plus memoized views/aggregates under the same version
+
+    Instances are handed to all sessions as-is (no per-session data copy).
+    `df` and DataFrame/Series results of `memo` are fresh objects over
+    read-only buffers, so adding or replacing columns stays local to the
+    caller and in-place edits of shared values raise.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: str, schema=None):
+        self._df = _freeze(df)
+        self.version = version
+        # SchemaReport from load-time normalization (None if nothing was loaded)
+        self.schema = schema
+        self._memo: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return _view(self._df)
+
+    @property
+    def empty(self) -> bool:
+        return self._df.empty
+
+    def memo(self, key: str, compute: Callable[[pd.DataFrame], Any]) -> Any:
+        """
+        Compute a derived view once per dataset version and reuse it across sessions
+        """
+        try:
+            return _view(self._memo[key])
+        except KeyError:
+            pass
+        with self._lock:
+            # Another session may have filled it while we waited for the lock
+            if key not in self._memo:
+                self._memo[key] = _freeze(compute(self.df))
+            return _view(self._memo[key])
@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Fetch Record/Replay Harness
+Records raw news-source responses and replays them from a local fixture
+server, so fetch benchmarks run offline and deterministically
+
+Modes (env FINSIGHT_FETCH_MODE, read by news_fetch.py):
+    live    - normal network fetches (default)
+    record  - live fetches, plus body/headers/latency saved to FINSIGHT_FIXTURE_DIR
+    replay  - every request is sent to the fixture server at FINSIGHT_REPLAY_URL;
+              news_fetch.py then writes under FINSIGHT_OUTPUT_DIR (required)
+
+Usage:
+    FINSIGHT_FETCH_MODE=record python news_fetch.py
+    python fetch_fixtures.py serve --latency-scale 1.0 --error-rate 0.1 --feed-size 200
+    python fetch_fixtures.py bench --runs 5 --error-rate 0.2 --timeout 2
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+import requests
+
+# Configuration (defaults; env vars are read per request so a harness can switch modes)
+FIXTURE_DIR = 'fixtures'
+REPLAY_URL = 'http://127.0.0.1:8765'
+INDEX_FILE = 'index.json'
+SECRET_PARAMS = {'apikey', 'api_key', 'token'}
+# Headers that describe the original transfer, not the (decoded) body we saved
+SKIP_HEADERS = {'content-length', 'content-encoding', 'transfer-encoding', 'connection', 'set-cookie'}
+
+_index_lock = threading.Lock()
+# Outcome of each replayed request since the last take_replay_outcomes()
+_outcomes = {'ok': 0, 'timed_out': 0, 'errored': 0}
+_outcomes_lock = threading.Lock()
+
+
+def fetch_mode() -> str:
+    return os.environ.get('FINSIGHT_FETCH_MODE', 'live').lower()
+
+
+def fixture_dir() -> str:
+    return os.environ.get('FINSIGHT_FIXTURE_DIR', FIXTURE_DIR)
+
+
+def replay_url() -> str:
+    return os.environ.get('FINSIGHT_REPLAY_URL', REPLAY_URL)
+
+
+def output_dir() -> str:
+    """Directory news_fetch.py writes its CSV, JSON and state into ('' = repo root)"""
+    return os.environ.get('FINSIGHT_OUTPUT_DIR', '')
+
+
+def _public_params(params: Optional[Dict]) -> Dict:
+    """Request params with API keys removed, so they never reach a fixture file"""
+    return {k: v for k, v in (params or {}).items() if k.lower() not in SECRET_PARAMS}
+
+
+def fixture_key(url: str, params: Optional[Dict] = None) -> str:
+    """Stable name for one request; identical in record and replay runs"""
+    public = _public_params(params)
+    full = f"{url}?{urlencode(sorted(public.items()))}" if public else url
+    return hashlib.sha1(full.encode('utf-8')).hexdigest()[:16]
+
+
+# ---- record -------------------------------------------------------------
+
+def _load_index(directory: str) -> Dict:
+    path = os.path.join(directory, INDEX_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def record_response(response: requests.Response, url: str, params: Optional[Dict],
+                    latency: float, directory: str = None):
+    """Save one live response (body, status, headers, latency) as a fixture"""
+    directory = directory or fixture_dir()
+    os.makedirs(directory, exist_ok=True)
+    key = fixture_key(url, params)
+
+    with open(os.path.join(directory, f"{key}.body"), 'wb') as f:
+        f.write(response.content)
+
+    with _index_lock:
+        index = _load_index(directory)
+        index[key] = {
+            'url': url,
+            'params': _public_params(params),
+            'status': response.status_code,
+            'headers': {k: v for k, v in response.headers.items() if k.lower() not in SKIP_HEADERS},
+            'latency_ms': round(latency * 1000, 1),
+            'bytes': len(response.content),
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        with open(os.path.join(directory, INDEX_FILE), 'w') as f:
+            json.dump(index, f, indent=2)
+
+
+# ---- fetch entry point used by news_fetch.py -------------------------------
+
+def http_get(url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+             timeout: float = 10) -> requests.Response:
+    """
+    GET honoring the current fetch mode; callers handle errors as before
+    """
+    mode = fetch_mode()
+    if mode == 'replay':
+        outcome = 'errored'
+        try:
+            response = requests.get(f"{replay_url()}/fixtures/{fixture_key(url, params)}",
+                                    headers=headers, timeout=timeout)
+            if response.ok:
+                outcome = 'ok'
+            return response
+        except requests.Timeout:
+            outcome = 'timed_out'
+            raise
+        finally:
+            with _outcomes_lock:
+                _outcomes[outcome] += 1
+
+    start = time.perf_counter()
+    response = requests.get(url, params=params, headers=headers, timeout=timeout)
+    if mode == 'record':
+        record_response(response, url, params, time.perf_counter() - start)
+    return response
+
+
+def take_replay_outcomes() -> Dict[str, int]:
+    """Counts of ok / timed-out / errored (non-2xx or connection) replay requests; resets them"""
+    with _outcomes_lock:
+        taken = dict(_outcomes)
+        for outcome in _outcomes:
+            _outcomes[outcome] = 0
+    return taken
+
+
+# ---- replay server --------------------------------------------------------
+
+_ITEM_RE = re.compile(rb'<(item|entry)\b.*?</\1>', re.S)
+_TITLE_RE = re.compile(rb'(<title[^>]*>)(.*?)(</title>)', re.S)
+_LINK_RE = re.compile(rb'(<link[^>]*>)(.*?)(</link>)', re.S)
+
+
+def resize_feed(body: bytes, size: int) -> bytes:
+    """
+    Truncate or grow a feed to `size` items; grown copies get unique
+    titles/links so they survive deduplication downstream
+    """
+    stripped = body.lstrip()
+    if stripped.startswith((b'{', b'[')):
+        data = json.loads(body)
+        if not isinstance(data, dict):
+            return body
+        list_key = next((k for k in ('articles', 'feed') if isinstance(data.get(k), list)), None)
+        if not list_key or not data[list_key]:
+            return body
+        items = data[list_key]
+        resized = []
+        for i in range(size):
+            item = dict(items[i % len(items)])
+            if i >= len(items):
+                item['title'] = f"{item.get('title', '')} #{i}"
+                item['url'] = f"{item.get('url', '')}#{i}"
+            resized.append(item)
+        data[list_key] = resized
+        return json.dumps(data).encode('utf-8')
+
+    items = [m.group(0) for m in _ITEM_RE.finditer(body)]
+    if not items:
+        return body
+    resized = []
+    for i in range(size):
+        item = items[i % len(items)]
+        if i >= len(items):
+            suffix = f" #{i}".encode()
+            item = _TITLE_RE.sub(lambda m: m.group(1) + m.group(2) + suffix + m.group(3), item, count=1)
+            item = _LINK_RE.sub(lambda m: m.group(1) + m.group(2) + f"#{i}".encode() + m.group(3), item, count=1)
+        resized.append(item)
+    first = _ITEM_RE.search(body)
+    last = list(_ITEM_RE.finditer(body))[-1]
+    return body[:first.start()] + b''.join(resized) + body[last.end():]
+
+
+class FixtureServer:
+    """
+    Local HTTP server replaying recorded fixtures
+
+    latency_scale multiplies each recorded latency, extra_latency adds a
+    fixed delay (seconds), error_rate returns HTTP 503 for that fraction of
+    requests, and feed_size resizes every feed. A fixed seed keeps runs
+    reproducible.
+    """
+
+    def __init__(self, directory: str = None, port: int = 8765, latency_scale: float = 0.0,
+                 extra_latency: float = 0.0, error_rate: float = 0.0, feed_size: int = None,
+                 seed: int = 0):
+        self.fixture_dir = directory or fixture_dir()
+        self.index = _load_index(self.fixture_dir)
+        self.port = port
+        self.latency_scale = latency_scale
+        self.extra_latency = extra_latency
+        self.error_rate = error_rate
+        self.feed_size = feed_size
+        self.rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._bodies: Dict[str, bytes] = {}
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def _body(self, key: str) -> bytes:
+        if key not in self._bodies:
+            with open(os.path.join(self.fixture_dir, f"{key}.body"), 'rb') as f:
+                body = f.read()
+            self._bodies[key] = resize_feed(body, self.feed_size) if self.feed_size else body
+        return self._bodies[key]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                key = self.path.rsplit('/', 1)[-1]
+                meta = server.index.get(key)
+                if not self.path.startswith('/fixtures/') or meta is None:
+                    self.send_error(404, f"No fixture for {self.path}")
+                    return
+
+                with server._rng_lock:
+                    fail = server.rng.random() < server.error_rate
+                delay = meta.get('latency_ms', 0) / 1000 * server.latency_scale + server.extra_latency
+                if delay > 0:
+                    time.sleep(delay)
+                if fail:
+                    self.send_error(503, "Injected fixture error")
+                    return
+
+                body = server._body(key)
+                self.send_response(meta.get('status', 200))
+                for name, value in meta.get('headers', {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client gave up (e.g. its timeout fired during an injected delay)
+
+            def log_message(self, format, *args):
+                pass  # Keep benchmark output clean
+
+        return Handler
+
+    def start(self) -> 'FixtureServer':
+        if not self.index:
+            print(f"⚠️ No fixtures in {self.fixture_dir}. Record some with FINSIGHT_FETCH_MODE=record")
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', self.port), self._handler())
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+# ---- benchmark ------------------------------------------------------------
+
+def run_benchmark(runs: int, server: FixtureServer, timeout: float) -> Dict:
+    """
+    Replay the full fetch -> clean -> save -> trending -> related pipeline `runs` times
+
+    Each run starts from empty trending/related state, so every run does the
+    same work (a shared state dir would make later runs skip all articles as
+    already seen).
+    """
+    import news_fetch
+    import related
+    import trending
+    # Counters live in the module news_fetch imported, not in __main__ when run as a script
+    from fetch_fixtures import take_replay_outcomes
+
+    os.environ['FINSIGHT_FETCH_MODE'] = 'replay'
+    os.environ['FINSIGHT_REPLAY_URL'] = server.url
+    news_fetch.FETCH_TIMEOUT = timeout
+
+    fetch_times, total_times, article_counts = [], [], []
+    outcomes = {'ok': 0, 'timed_out': 0, 'errored': 0}
+    take_replay_outcomes()
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            start = time.perf_counter()
+            articles = news_fetch.fetch_all_sources()
+            fetched = time.perf_counter()
+            for outcome, count in take_replay_outcomes().items():
+                outcomes[outcome] += count
+            df = news_fetch.clean_and_deduplicate(articles)
+            news_fetch.save_to_csv(df, os.path.join(tmp, 'finance_news.csv'))
+            trending.update_trending(df.to_dict('records'), os.path.join(tmp, 'trending_state.json'),
+                                     os.path.join(tmp, 'trending_topics.json'))
+            related.update_related(df.to_dict('records'), os.path.join(tmp, 'related_index.json'),
+                                   os.path.join(tmp, 'related_articles.json'))
+            fetch_times.append(fetched - start)
+            total_times.append(time.perf_counter() - start)
+            article_counts.append(len(articles))
+
+    return {
+        'runs': runs,
+        'articles_per_run': sum(article_counts) / runs,
+        'fetch_s': sum(fetch_times) / runs,
+        'total_s': sum(total_times) / runs,
+        'articles_per_s': sum(article_counts) / sum(fetch_times) if sum(fetch_times) else 0.0,
+        'sources_ok': outcomes['ok'],
+        'sources_timed_out': outcomes['timed_out'],
+        'sources_errored': outcomes['errored'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded news fetches from a local fixture server")
+    parser.add_argument('command', choices=['serve', 'bench'])
+    parser.add_argument('--fixture-dir', default=fixture_dir())
+    parser.add_argument('--port', type=int, default=8765, help="0 picks a free port")
+    parser.add_argument('--latency-scale', type=float, default=0.0,
+                        help="Multiplier on recorded latencies (1.0 = as recorded)")
+    parser.add_argument('--extra-latency', type=float, default=0.0, help="Fixed delay per request, seconds")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument('--feed-size', type=int, default=None, help="Items per feed (truncate or repeat)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--runs', type=int, default=3, help="bench: pipeline repetitions")
+    parser.add_argument('--timeout', type=float, default=10.0, help="bench: client timeout, seconds")
+    args = parser.parse_args()
+
+    server = FixtureServer(args.fixture_dir, args.port, args.latency_scale, args.extra_latency,
+                           args.error_rate, args.feed_size, args.seed)
+
+    if args.command == 'serve':
+        server.start()
+        print(f"🎞️ Serving {len(server.index)} fixtures from {args.fixture_dir} at {server.url}")
+        print(f"   Run: FINSIGHT_FETCH_MODE=replay FINSIGHT_REPLAY_URL={server.url} "
+              f"FINSIGHT_OUTPUT_DIR=replay_output python news_fetch.py")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.stop()
+        return 0
+
+    with server:
+        result = run_benchmark(args.runs, server, args.timeout)
+
+    print("\n" + "=" * 60)
+    print("⏱️ Replay Benchmark")
+    print("=" * 60)
+    print(f"Runs:               {result['runs']}")
+    print(f"Articles per run:   {result['articles_per_run']:.0f}")
+    print(f"Fetch time (avg):   {result['fetch_s']:.3f} s")
+    print(f"Pipeline (avg):     {result['total_s']:.3f} s")
+    print(f"Fetch throughput:   {result['articles_per_s']:.1f} articles/s")
+    print(f"Source requests:    {result['sources_ok']} ok / {result['sources_timed_out']} timed out / "
+          f"{result['sources_errored']} errored (all runs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Concurrent Viewer Load Test
+Runs N headless dashboard sessions against app.py at once and reports
+render latency percentiles and process memory as N grows
+
+Usage:
+    python load_test.py                       # N = 1, 2, 4, 8, 16, 32
+    python load_test.py --sessions 10 50 100 --reruns 3
+"""
+
+import argparse
+import gc
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from streamlit.testing.v1 import AppTest
+
+APP_FILE = 'app.py'
+
+
+def current_rss_mb() -> float:
+    """Resident memory of this process in MB (falls back to peak RSS off Linux)"""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * resource.getpagesize() / 1024 / 1024
+    except (OSError, IndexError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is KB on Linux, bytes on macOS
+        return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def run_session(reruns: int, timeout: float) -> List[float]:
+    """
+    One simulated viewer: an initial page load followed by `reruns` reruns
+    (what Streamlit does on every widget interaction)
+    """
+    at = AppTest.from_file(APP_FILE, default_timeout=timeout)
+    latencies = []
+    for _ in range(reruns + 1):
+        start = time.perf_counter()
+        at.run()
+        latencies.append(time.perf_counter() - start)
+        if at.exception:
+            raise RuntimeError(f"App raised: {at.exception[0].message}")
+    return latencies
+
+
+def run_level(sessions: int, reruns: int, timeout: float) -> Dict:
+    gc.collect()
+    rss_before = current_rss_mb()
+
+    # Poll RSS in the background so the peak while sessions are alive is captured
+    samples = [rss_before]
+    done = threading.Event()
+
+    def sample_memory():
+        while not done.wait(0.05):
+            samples.append(current_rss_mb())
+
+    sampler = threading.Thread(target=sample_memory, daemon=True)
+    sampler.start()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        futures = [pool.submit(run_session, reruns, timeout) for _ in range(sessions)]
+        results = [f.result() for f in futures]
+    wall = time.perf_counter() - start
+
+    done.set()
+    sampler.join()
+    rss_peak = max(samples)
+
+    latencies = [lat for session in results for lat in session]
+    return {
+        'sessions': sessions,
+        'runs': len(latencies),
+        'p50': percentile(latencies, 50) * 1000,
+        'p95': percentile(latencies, 95) * 1000,
+        'p99': percentile(latencies, 99) * 1000,
+        'max': max(latencies) * 1000,
+        'throughput': len(latencies) / wall,
+        'rss': rss_peak,
+        'rss_delta': rss_peak - rss_before,
+    }
+
+
+def print_report(rows: List[Dict]):
+    header = f"{'N':>5} {'runs':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'runs/s':>8} {'RSS MB':>8} {'ΔRSS MB':>8}"
+    print("\n" + header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['sessions']:>5} {r['runs']:>6} {r['p50']:>9.1f} {r['p95']:>9.1f} {r['p99']:>9.1f} "
+            f"{r['max']:>9.1f} {r['throughput']:>8.1f} {r['rss']:>8.1f} {r['rss_delta']:>8.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-viewer load test for the FinSight dashboard")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32],
+                        help="Concurrent session counts to test")
+    parser.add_argument('--reruns', type=int, default=2,
+                        help="Reruns per session after the first page load")
+    parser.add_argument('--timeout', type=float, default=60.0,
+                        help="Per-run timeout in seconds")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("🚦 FinSight Load Test")
+    print(f"📄 App: {APP_FILE} | Reruns per session: {args.reruns}")
+    print("=" * 60)
+
+    # Warm the shared cache so levels measure steady-state serving, then report it
+    cold = run_session(0, args.timeout)[0]
+    print(f"❄️ Cold load (cache miss): {cold * 1000:.1f} ms, RSS {current_rss_mb():.1f} MB")
+
+    rows = []
+    for n in args.sessions:
+        print(f"▶️ Running {n} concurrent sessions...")
+        rows.append(run_level(n, args.reruns, args.timeout))
+
+    print_report(rows)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,16 +4,21 @@ Fetches latest financial news from multiple sources and saves to CSV
 """
 
 import pandas as pd
-import requests
 from datetime import datetime, timedelta
 import json
 import os
 from typing import List, Dict
 import time
 
+from fetch_fixtures import fetch_mode, http_get, output_dir
+from related import RELATED_ARTICLES_FILE, RELATED_INDEX_FILE, update_related
+from trending import TRENDING_STATE_FILE, TRENDING_TOPICS_FILE, update_trending
+
 # Configuration
 CSV_FILE = 'finance_news.csv'
 MAX_ARTICLES = 100
+FETCH_TIMEOUT = 10  # seconds per request
+POLITE_DELAY = 1    # seconds between live RSS feeds
 
 def fetch_from_newsapi(api_key: str = None) -> List[Dict]:
     """
@@ -37,7 +42,7 @@ def fetch_from_newsapi(api_key: str = None) -> List[Dict]:
             'apiKey': api_key
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = http_get(url, params=params, timeout=FETCH_TIMEOUT)
         response.raise_for_status()
         
         data = response.json()
@@ -61,6 +66,13 @@ def fetch_from_newsapi(api_key: str = None) -> List[Dict]:
         print(f"❌ Error fetching from NewsAPI: {str(e)}")
         return []
 
+def feed_headers(feedparser) -> Dict:
+    """
+    Headers feedparser would send if it fetched the feed itself; some feeds
+    reject the default python-requests User-Agent
+    """
+    return {'User-Agent': feedparser.USER_AGENT, 'Accept': feedparser.http.ACCEPT_HEADER}
+
 def fetch_from_rss_feeds() -> List[Dict]:
     """
     Fetch financial news from RSS feeds (no API key required)
@@ -81,7 +93,9 @@ def fetch_from_rss_feeds() -> List[Dict]:
     
     for feed_url, source, category in feeds:
         try:
-            feed = feedparser.parse(feed_url)
+            response = http_get(feed_url, headers=feed_headers(feedparser), timeout=FETCH_TIMEOUT)
+            response.raise_for_status()
+            feed = feedparser.parse(response.content)
             
             for entry in feed.entries[:20]:  # Limit to 20 per feed
                 articles.append({
@@ -95,7 +109,8 @@ def fetch_from_rss_feeds() -> List[Dict]:
                 })
             
             print(f"✅ Fetched {min(20, len(feed.entries))} articles from {source}")
-            time.sleep(1)  # Be nice to servers
+            if fetch_mode() != 'replay':
+                time.sleep(POLITE_DELAY)  # Be nice to servers
             
         except Exception as e:
             print(f"❌ Error fetching from {source}: {str(e)}")
@@ -115,7 +130,9 @@ def fetch_from_google_news() -> List[Dict]:
     try:
         # Google News RSS for business/finance
         feed_url = 'https://news.google.com/rss/search?q=finance+OR+stocks+OR+market&hl=en-US&gl=US&ceid=US:en'
-        feed = feedparser.parse(feed_url)
+        response = http_get(feed_url, headers=feed_headers(feedparser), timeout=FETCH_TIMEOUT)
+        response.raise_for_status()
+        feed = feedparser.parse(response.content)
         
         articles = []
         for entry in feed.entries[:30]:
@@ -156,7 +173,7 @@ def fetch_from_alphavantage(api_key: str = None) -> List[Dict]:
             'apikey': api_key
         }
         
-        response = requests.get(url, params=params, timeout=10)
+        response = http_get(url, params=params, timeout=FETCH_TIMEOUT)
         response.raise_for_status()
         
         data = response.json()
@@ -224,15 +241,10 @@ def save_to_csv(df: pd.DataFrame, filename: str = CSV_FILE):
         print(f"❌ Error saving to CSV: {str(e)}")
         return False
 
-def main():
+def fetch_all_sources() -> List[Dict]:
     """
-    Main function to fetch and save financial news
+    Fetch from every enabled source
     """
-    print("=" * 60)
-    print("🚀 Starting Financial News Fetch")
-    print(f"⏰ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print("=" * 60)
-    
     all_articles = []
     
     # Fetch from multiple sources
@@ -250,19 +262,52 @@ def main():
     # print("\n📡 Fetching from Alpha Vantage...")
     # all_articles.extend(fetch_from_alphavantage())
     
+    return all_articles
+
+def main():
+    """
+    Main function to fetch and save financial news
+    """
+    print("=" * 60)
+    print("🚀 Starting Financial News Fetch")
+    print(f"⏰ Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    if fetch_mode() != 'live':
+        print(f"🎞️ Fetch mode: {fetch_mode()}")
+    print("=" * 60)
+    
+    # Replayed data must never overwrite the tracked CSV/JSON files or live ingest state
+    out_dir = output_dir()
+    if fetch_mode() == 'replay' and not out_dir:
+        print("❌ Replay mode needs FINSIGHT_OUTPUT_DIR so replayed data doesn't overwrite tracked files")
+        exit(1)
+    if out_dir:
+        print(f"📁 Output directory: {out_dir}")
+        os.makedirs(out_dir, exist_ok=True)
+    csv_file = os.path.join(out_dir, CSV_FILE)
+    
+    all_articles = fetch_all_sources()
+    
     # Clean and save
     print("\n🧹 Cleaning and deduplicating...")
     df = clean_and_deduplicate(all_articles)
     
     if not df.empty:
         print("\n💾 Saving to CSV...")
-        success = save_to_csv(df)
+        success = save_to_csv(df, csv_file)
+        
+        print("\n🔥 Updating trending topics...")
+        update_trending(df.to_dict('records'), os.path.join(out_dir, TRENDING_STATE_FILE),
+                        os.path.join(out_dir, TRENDING_TOPICS_FILE))
+        
+        print("\n🔗 Updating related-articles index...")
+        update_related(df.to_dict('records'), os.path.join(out_dir, RELATED_INDEX_FILE),
+                       os.path.join(out_dir, RELATED_ARTICLES_FILE))
         
         if success:
             print("\n" + "=" * 60)
             print("✅ SUCCESS: News fetch completed!")
             print(f"📊 Total articles: {len(df)}")
-            print(f"📁 File: {CSV_FILE}")
+            print(f"📁 File: {csv_file}")
             print("=" * 60)
         else:
             print("\n❌ Failed to save data")
@@ -272,7 +317,7 @@ def main():
         
         # Create empty CSV with headers to prevent app errors
         empty_df = pd.DataFrame(columns=['title', 'description', 'url', 'source', 'date', 'category', 'image_url'])
-        save_to_csv(empty_df)
+        save_to_csv(empty_df, csv_file)
         exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+"""
+News Data Schema
+Maps any input news table onto one canonical, typed schema at load time
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+# Canonical column -> accepted input names, in priority order
+COLUMN_ALIASES: Dict[str, List[str]] = {
+    'title': ['title', 'headline'],
+    'description': ['description', 'summary', 'content'],
+    'url': ['url', 'link'],
+    'source': ['source'],
+    'category': ['category', 'topic'],
+    'date': ['date', 'published', 'timestamp'],
+    'image_url': ['image_url'],
+}
+CANONICAL_COLUMNS = list(COLUMN_ALIASES)
+TEXT_COLUMNS = [c for c in CANONICAL_COLUMNS if c != 'date']
+REQUIRED_COLUMNS = ['title', 'url']
+
+# Long article bodies are only ever shown as a preview
+CONTENT_PREVIEW_CHARS = 200
+
+
+class NewsRecord(NamedTuple):
+    """Compact per-article record for render loops"""
+    title: str
+    description: str
+    url: str
+    source: str
+    category: str
+    date: pd.Timestamp
+    image_url: str
+
+
+class SchemaReport(NamedTuple):
+    """What normalization did, so mismatches are reported once per load"""
+    mapping: Dict[str, List[str]]
+    ignored: List[str]
+    issues: List[str]
+    distribution_column: Optional[str]
+
+
+def _preview(text: pd.Series) -> pd.Series:
+    too_long = text.str.len().fillna(0) > CONTENT_PREVIEW_CHARS
+    return text.where(~too_long, text.str[:CONTENT_PREVIEW_CHARS] + "...")
+
+
+def _text(raw: pd.Series, column: str) -> pd.Series:
+    values = raw.astype('string').str.strip().replace('', pd.NA)
+    return _preview(values) if column == 'content' else values
+
+
+def normalize_news_frame(raw: pd.DataFrame) -> Tuple[pd.DataFrame, SchemaReport]:
+    """
+    Return (canonical DataFrame, report)
+
+    When several aliases exist (e.g. description and summary) they are
+    coalesced in priority order, once, column-wise. Every canonical column
+    is present afterwards: text columns are strings with '' for missing
+    values and `date` is datetime64 (naive UTC, NaT if unparseable), so
+    display code can access columns directly.
+    """
+    mapping: Dict[str, List[str]] = {}
+    issues: List[str] = []
+    out = pd.DataFrame(index=raw.index)
+
+    for canonical, aliases in COLUMN_ALIASES.items():
+        present = [a for a in aliases if a in raw.columns]
+        mapping[canonical] = present
+
+        if not present:
+            if canonical in REQUIRED_COLUMNS:
+                issues.append(f"missing required column '{canonical}' (accepted: {', '.join(aliases)})")
+            out[canonical] = pd.Series(pd.NaT, index=raw.index, dtype='datetime64[ns]') if canonical == 'date' else ''
+            continue
+        if present != [canonical]:
+            issues.append(f"'{canonical}' built from: {', '.join(present)}")
+
+        if canonical == 'date':
+            values = None
+            for column in present:
+                parsed = pd.to_datetime(raw[column], errors='coerce', utc=True, format='mixed')
+                unparsed = int(parsed.isna().sum() - raw[column].isna().sum())
+                if unparsed > 0:
+                    issues.append(f"{unparsed} unparseable value(s) in '{column}'")
+                values = parsed if values is None else values.fillna(parsed)
+            out[canonical] = values.dt.tz_localize(None)
+        else:
+            values = _text(raw[present[0]], present[0])
+            for column in present[1:]:
+                values = values.fillna(_text(raw[column], column))
+            out[canonical] = values.fillna('').astype(str)
+
+    # Rows still empty after coalescing; missing columns were reported above
+    for canonical in REQUIRED_COLUMNS:
+        empty = int((out[canonical] == '').sum())
+        if mapping[canonical] and empty > 0:
+            issues.append(f"{empty} row(s) missing '{canonical}'")
+
+    used = {c for columns in mapping.values() for c in columns}
+    ignored = [c for c in raw.columns if c not in used]
+
+    # Pie chart grouping: prefer category, fall back to source
+    distribution_column = next(
+        (c for c in ('category', 'source') if (out[c] != '').any()),
+        None
+    )
+
+    return out, SchemaReport(mapping, ignored, issues, distribution_column)
+
+
+def iter_records(df: pd.DataFrame):
+    """Yield NewsRecord tuples from a canonical frame"""
+    return map(NewsRecord._make, df[CANONICAL_COLUMNS].itertuples(index=False, name=None))
@@ -0,0 +1,517 @@
+"""
+Trending Topics Engine
+Streaming term counts over sliding time windows with burst detection
+"""
+
+import bisect
+import hashlib
+import json
+import math
+import os
+import re
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional
+
+# Configuration
+STATE_DIR = '.state'           # Ingest state; cached by CI, never committed
+TRENDING_STATE_FILE = os.path.join(STATE_DIR, 'trending_state.json')
+TRENDING_TOPICS_FILE = 'trending_topics.json'  # Compact output read by the dashboard
+TRENDING_WINDOWS = [4, 8, 12, 24, 48]          # Hours offered in the Analytics tab
+TOP_TOPICS = 15
+BUCKET_SECONDS = 3600          # One bucket per hour
+BASELINE_HOURS = 72            # History kept for the baseline window
+# Sized from expected load: ~20 articles/hour x 40-80 uni/bigrams each is
+# ~1,500 term insertions and ~1,000 distinct terms per bucket. Space-Saving
+# keeps every term whose true bucket count exceeds insertions / capacity,
+# and sketch rows are sparse, so a wide sketch only costs what it stores.
+HEAVY_HITTERS = 2048           # Candidate terms tracked per bucket
+SKETCH_WIDTH = 8192            # Per bucket; buckets are never merged into one sketch
+SKETCH_DEPTH = 4
+# Burst score a term needs to count as spiking. Thousands of terms are tested
+# per window, so at z = 3 a few pure-noise terms would pass by chance; on
+# steady synthetic traffic the highest noise score was 3.8.
+MIN_SCORE = 4.0
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been
+before being below between both but by can could did do does doing down during each
+few for from further had has have having he her here hers him his how i if in into is
+it its itself just more most my new no nor not now of off on once only or other our
+out over own same says said she should so some such than that the their them then
+there these they this those through to too under until up very was we were what when
+where which while who whom why will with would you your
+""".split())
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_TOKEN_RE = re.compile(r"[a-z][a-z0-9&'\-]*[a-z0-9]|[a-z]")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split article text into lowercase terms, dropping HTML tags and stopwords
+    """
+    if not isinstance(text, str) or not text:
+        return []
+    text = _TAG_RE.sub(' ', text).lower()
+    return [t for t in _TOKEN_RE.findall(text) if len(t) > 2 and t not in STOPWORDS]
+
+
+def extract_terms(*texts: str) -> List[str]:
+    """
+    Unigrams plus adjacent bigrams ("interest rates") for one article
+    """
+    terms = []
+    for text in texts:
+        tokens = tokenize(text)
+        terms.extend(tokens)
+        terms.extend(f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    # Count each term once per article so one long story can't dominate
+    return list(dict.fromkeys(terms))
+
+
+class CountMinSketch:
+    """
+    Fixed-size frequency sketch; estimates never under-count
+    """
+
+    def __init__(self, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        # Rows are kept sparse since a bucket sees only a few hundred terms
+        self.rows: List[Dict[int, int]] = [{} for _ in range(depth)]
+
+    def indexes(self, term: str) -> List[int]:
+        # Stable across processes, unlike the builtin hash()
+        digest = hashlib.md5(term.encode('utf-8')).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, term: str, count: int = 1):
+        for row, idx in zip(self.rows, self.indexes(term)):
+            row[idx] = row.get(idx, 0) + count
+
+    def estimate(self, term: str, indexes: List[int] = None) -> int:
+        # Callers probing many same-shaped sketches can hash the term once
+        indexes = indexes or self.indexes(term)
+        return min(row.get(idx, 0) for row, idx in zip(self.rows, indexes))
+
+    def to_dict(self) -> Dict:
+        return {
+            'width': self.width,
+            'depth': self.depth,
+            'rows': [{str(k): v for k, v in row.items()} for row in self.rows],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'CountMinSketch':
+        sketch = cls(data['width'], data['depth'])
+        sketch.rows = [{int(k): v for k, v in row.items()} for row in data['rows']]
+        return sketch
+
+
+class HeavyHitters:
+    """
+    Space-Saving style top-k tracker: keeps at most `capacity` candidate terms
+
+    When full, the lowest quarter of counters is evicted in one batch
+    (amortized O(log k) per insert instead of a min-scan per insert).
+    `floor` is the largest count ever evicted: any untracked term has a
+    true count no larger than it, and newly tracked terms start from it.
+    """
+
+    def __init__(self, capacity: int = HEAVY_HITTERS):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.evicted = 0
+
+    def add(self, term: str, count: int = 1):
+        if term in self.counts:
+            self.counts[term] += count
+            return
+        if len(self.counts) >= self.capacity:
+            ordered = sorted(self.counts.items(), key=lambda item: item[1])
+            for victim, victim_count in ordered[:max(self.capacity // 4, 1)]:
+                del self.counts[victim]
+                self.evicted = max(self.evicted, victim_count)
+        self.counts[term] = self.evicted + count
+
+    def terms(self) -> List[str]:
+        return list(self.counts)
+
+    def floor(self) -> int:
+        return self.evicted
+
+
+class TimeBucket:
+    """Term counts for one fixed slice of time"""
+
+    def __init__(self, start: int, sketch: CountMinSketch = None, hitters: HeavyHitters = None):
+        self.start = start
+        self.sketch = sketch or CountMinSketch()
+        self.hitters = hitters or HeavyHitters()
+        self.articles = 0
+
+    def add_terms(self, terms: Iterable[str]):
+        for term in terms:
+            self.sketch.add(term)
+            self.hitters.add(term)
+        self.articles += 1
+
+    def bound(self, term: str) -> int:
+        """Cheap upper bound from the tracker alone"""
+        return self.hitters.counts.get(term, self.hitters.evicted)
+
+    def estimate(self, term: str, indexes: List[int] = None) -> int:
+        """
+        Upper-bound count for one term: the tighter of the sketch and the
+        tracked counter (or, for untracked terms, the eviction floor)
+        """
+        bound = self.bound(term)
+        return min(self.sketch.estimate(term, indexes), bound) if bound else 0
+
+
+class TrendingEngine:
+    """
+    Sliding-window trending terms with burst scoring against a baseline
+
+    Articles are bucketed by publish time. The recent window is compared
+    with the preceding baseline window, so memory stays bounded by the
+    number of buckets rather than the number of articles seen.
+    """
+
+    def __init__(self, bucket_seconds: int = BUCKET_SECONDS, baseline_hours: int = BASELINE_HOURS):
+        self.bucket_seconds = bucket_seconds
+        self.baseline_hours = baseline_hours
+        self.buckets: Dict[int, TimeBucket] = {}
+        # Article key -> bucket start, so re-fetched articles are not counted twice
+        self.seen: Dict[str, int] = {}
+
+    # ---- ingest -------------------------------------------------------
+
+    def _bucket_start(self, ts: float) -> int:
+        return int(ts // self.bucket_seconds) * self.bucket_seconds
+
+    def _horizon_seconds(self) -> int:
+        return self.baseline_hours * 3600
+
+    def add_article(self, article: Dict, now: float = None) -> bool:
+        """
+        Count one article's terms; returns False if skipped (duplicate or too old)
+        """
+        now = now or time.time()
+        key = article_key(article)
+        if key in self.seen:
+            return False
+
+        ts = _to_epoch(article.get('date'))
+        if ts is None or ts > now:
+            ts = now
+        if ts < now - self._horizon_seconds():
+            return False
+
+        start = self._bucket_start(ts)
+        bucket = self.buckets.get(start)
+        if bucket is None:
+            bucket = self.buckets[start] = TimeBucket(start)
+
+        bucket.add_terms(extract_terms(article.get('title'), article.get('description')))
+        self.seen[key] = start
+        return True
+
+    def add_articles(self, articles: Iterable[Dict], now: float = None) -> int:
+        now = now or time.time()
+        added = sum(1 for article in articles if self.add_article(article, now))
+        self.expire(now)
+        return added
+
+    def expire(self, now: float = None):
+        """Drop buckets (and their seen keys) that fell out of the baseline horizon"""
+        now = now or time.time()
+        cutoff = self._bucket_start(now - self._horizon_seconds())
+        for start in [s for s in self.buckets if s < cutoff]:
+            del self.buckets[start]
+        self.seen = {k: s for k, s in self.seen.items() if s >= cutoff}
+
+    # ---- query --------------------------------------------------------
+
+    def _window(self, start: float, end: float) -> List[TimeBucket]:
+        return [b for s, b in self.buckets.items() if start <= s < end]
+
+    def trending(self, window_hours: int = 24, top_n: int = 10, now: float = None,
+                 min_count: int = 2) -> List[Dict]:
+        """
+        Terms whose frequency in the last `window_hours` spikes above baseline
+        """
+        return self.trending_windows([window_hours], top_n, now, min_count)[window_hours]
+
+    def trending_windows(self, windows: List[int], top_n: int = 10, now: float = None,
+                         min_count: int = 2) -> Dict[int, List[Dict]]:
+        """
+        Trending terms for several window lengths in one pass
+
+        Burst score compares the recent count with the baseline count scaled to
+        the recent window length, as a z-score on Anscombe (variance-
+        stabilized) Poisson counts, which stays honest for the small counts
+        most terms have and includes both counts' variance:
+        2 * (sqrt(observed + 3/8) - sqrt(scale * (baseline + 3/8))) / sqrt(1 + scale).
+        Only terms scoring at least MIN_SCORE are returned. The baseline runs
+        from the oldest bucket held (at most the 72h horizon), so a young
+        state is not scaled as if it had a full baseline; a window with no
+        baseline history returns nothing.
+        Counts are summed per bucket, so sketch collisions never accumulate
+        across a window, and each term's per-bucket counts are computed once
+        and shared by every window.
+        """
+        now = now or time.time()
+        baseline_start = self._bucket_start(now - self._horizon_seconds())
+        buckets = sorted(self._window(baseline_start, now + 1), key=lambda b: b.start)
+        starts = [b.start for b in buckets]
+        history_start = max(baseline_start, starts[0]) if starts else baseline_start
+
+        # Whole buckets covering at least the last N hours; every article from
+        # that span is in the recent window and none leaks into the baseline
+        splits = {}
+        for hours in windows:
+            window_start = self._bucket_start(now - hours * 3600)
+            recent_hours = (now - window_start) / 3600
+            baseline_hours = (window_start - history_start) / 3600
+            if baseline_hours <= 0:
+                continue  # Nothing to compare against yet
+            splits[hours] = (bisect.bisect_left(starts, window_start), recent_hours / baseline_hours)
+
+        # Candidates: terms tracked in a bucket of the widest window, remembering
+        # the newest bucket tracking each one
+        widest = min(split for split, _ in splits.values()) if splits else len(buckets)
+        last_tracked: Dict[str, int] = {}
+        for i in range(widest, len(buckets)):
+            for term in buckets[i].hitters.counts:
+                last_tracked[term] = i
+
+        probe = CountMinSketch()  # Same width/depth as bucket sketches; used only for hashing
+        results: Dict[int, List[Dict]] = {hours: [] for hours in windows}
+        for term, newest in last_tracked.items():
+            # Tracker-only bound first: most candidates are rare and drop out here
+            if sum(buckets[i].bound(term) for i in range(widest, len(buckets))) < min_count:
+                continue
+            indexes = probe.indexes(term)
+            counts = [bucket.estimate(term, indexes) for bucket in buckets]
+            for hours, (split, scale) in splits.items():
+                if newest < split:
+                    continue  # Not a candidate in this (shorter) window
+                observed = sum(counts[split:])
+                if observed < min_count:
+                    continue
+                base = sum(counts[:split])
+                score = (2 * (math.sqrt(observed + 0.375) - math.sqrt(scale * (base + 0.375)))
+                         / math.sqrt(1 + scale))
+                if score >= MIN_SCORE:
+                    results[hours].append({
+                        'term': term,
+                        'count': observed,
+                        'baseline': base,
+                        'score': round(score, 3),
+                    })
+
+        for hours, found in results.items():
+            # On equal scores, bigrams rank first so they can absorb their unigrams
+            found.sort(key=lambda r: (r['score'], r['count'], r['term'].count(' ')), reverse=True)
+            results[hours] = _drop_redundant_unigrams(found)[:top_n]
+        return results
+
+    # ---- persistence --------------------------------------------------
+
+    def to_dict(self) -> Dict:
+        return {
+            'bucket_seconds': self.bucket_seconds,
+            'baseline_hours': self.baseline_hours,
+            'seen': self.seen,
+            'buckets': [
+                {
+                    'start': b.start,
+                    'articles': b.articles,
+                    'sketch': b.sketch.to_dict(),
+                    'hitters': {'capacity': b.hitters.capacity, 'counts': b.hitters.counts,
+                                'evicted': b.hitters.evicted},
+                }
+                for b in sorted(self.buckets.values(), key=lambda b: b.start)
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'TrendingEngine':
+        engine = cls(data.get('bucket_seconds', BUCKET_SECONDS), data.get('baseline_hours', BASELINE_HOURS))
+        engine.seen = dict(data.get('seen', {}))
+        for item in data.get('buckets', []):
+            hitters = HeavyHitters(item['hitters']['capacity'])
+            hitters.counts = dict(item['hitters']['counts'])
+            hitters.evicted = item['hitters'].get('evicted', 0)
+            bucket = TimeBucket(item['start'], CountMinSketch.from_dict(item['sketch']), hitters)
+            bucket.articles = item.get('articles', 0)
+            engine.buckets[bucket.start] = bucket
+        return engine
+
+
+def article_key(article: Dict) -> str:
+    raw = article.get('url') or article.get('link') or article.get('title') or ''
+    return hashlib.md5(str(raw).encode('utf-8')).hexdigest()[:16]
+
+
+def _to_epoch(value) -> Optional[float]:
+    """Convert a datetime / pandas Timestamp / ISO string to epoch seconds"""
+    if value is None or value != value:  # None or NaN/NaT
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.timestamp()
+    return None
+
+
+def _drop_redundant_unigrams(results: List[Dict]) -> List[Dict]:
+    """Hide a single word when a higher-ranked bigram already covers it"""
+    covered = set()
+    kept = []
+    for r in results:
+        words = r['term'].split()
+        if len(words) == 1 and r['term'] in covered:
+            continue
+        covered.update(words)
+        kept.append(r)
+    return kept
+
+
+def load_engine(path: str = TRENDING_STATE_FILE) -> TrendingEngine:
+    """Load saved engine state, or start empty if none exists"""
+    if not os.path.exists(path):
+        return TrendingEngine()
+    try:
+        with open(path, 'r') as f:
+            return TrendingEngine.from_dict(json.load(f))
+    except (ValueError, KeyError) as e:
+        print(f"⚠️ Could not read {path} ({e}); starting fresh trending state")
+        return TrendingEngine()
+
+
+def save_engine(engine: TrendingEngine, path: str = TRENDING_STATE_FILE) -> bool:
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(engine.to_dict(), f, separators=(',', ':'))
+        return True
+    except Exception as e:
+        print(f"❌ Error saving trending state: {str(e)}")
+        return False
+
+
+def export_topics(engine: TrendingEngine, path: str = TRENDING_TOPICS_FILE, now: float = None) -> bool:
+    """
+    Write the top spiking topics for each dashboard window; this small file
+    is all the dashboard reads
+    """
+    now = now or time.time()
+    # No timestamp inside: the file only changes when the topics do, so a
+    # fetch with no new news leaves nothing for CI to commit
+    topics = {
+        'windows': {str(h): found for h, found in engine.trending_windows(TRENDING_WINDOWS, TOP_TOPICS, now).items()},
+    }
+    try:
+        with open(path, 'w') as f:
+            json.dump(topics, f, indent=1)
+        return True
+    except Exception as e:
+        print(f"❌ Error saving trending topics: {str(e)}")
+        return False
+
+
+def load_topics(path: str = TRENDING_TOPICS_FILE) -> Optional[Dict]:
+    """Exported topics, or None if news_fetch.py has not produced them yet"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except ValueError:
+        return None
+
+
+def update_trending(articles: List[Dict], state_path: str = TRENDING_STATE_FILE,
+                    topics_path: str = TRENDING_TOPICS_FILE) -> int:
+    """
+    Feed freshly fetched articles into the saved engine state and re-export topics
+    """
+    engine = load_engine(state_path)
+    added = engine.add_articles(articles)
+    save_engine(engine, state_path)
+    # Scores drift as the windows slide, so only re-export when there is news
+    if added or not os.path.exists(topics_path):
+        export_topics(engine, topics_path)
+    print(f"✅ Trending: counted {added} new articles across {len(engine.buckets)} hourly windows")
+    return added
+
+
+def _synthetic_articles(rng, count: int, span_hours: float, now: float, spike: str = None,
+                        spike_hours: float = 24, spike_rate: float = 0.25) -> List[Dict]:
+    """Zipf-like background articles spread uniformly over `span_hours`"""
+    vocab = [f"word{i}" for i in range(3000)]
+    weights = [1 / (i + 1) for i in range(len(vocab))]
+    articles = []
+    for i in range(count):
+        ts = now - rng.uniform(0, span_hours * 3600)
+        title = rng.choices(vocab, weights, k=10)
+        if spike and ts >= now - spike_hours * 3600 and rng.random() < spike_rate:
+            title[rng.randrange(10)] = spike
+        articles.append({
+            'title': ' '.join(title),
+            'description': ' '.join(rng.choices(vocab, weights, k=30)),
+            'url': f"https://example.com/{i}",
+            'date': datetime.fromtimestamp(ts, timezone.utc),
+        })
+    return articles
+
+
+def self_check(seed: int = 0) -> bool:
+    """
+    Simulate 1,200 articles over 71h with "tariff" injected into 25% of the
+    last 24h and confirm it surfaces with a near-true count; then confirm
+    steady traffic (a full 72h, and a fresh 24h state) reports no spikes
+    """
+    import random
+
+    rng = random.Random(seed)
+    now = 1_700_000_000.0
+    engine = TrendingEngine()
+    articles = _synthetic_articles(rng, 1200, 71, now, spike='tariff')
+    true_count = sum('tariff' in a['title'].split() for a in articles)
+    engine.add_articles(articles, now)
+
+    top = engine.trending(window_hours=24, top_n=10, now=now)
+    found = next((r for r in top if r['term'] == 'tariff'), None)
+    print(f"Injected 'tariff' in {true_count} articles; top 10:")
+    for r in top:
+        print(f"  {r['term']:<24} count={r['count']:<5} baseline={r['baseline']:<5} score={r['score']}")
+    ok = found is not None and abs(found['count'] - true_count) <= max(2, true_count * 0.05)
+    print("✅ Spike detected with near-true count" if ok else "❌ Spike missed or miscounted")
+
+    for label, count, span in [('steady 72h', 1500, 72), ('fresh 24h state', 500, 24)]:
+        engine = TrendingEngine()
+        engine.add_articles(_synthetic_articles(rng, count, span, now), now)
+        noise = engine.trending_windows([4, 24], TOP_TOPICS, now)
+        flagged = {h: len(found) for h, found in noise.items()}
+        quiet = all(n == 0 for n in flagged.values())
+        print(f"{'✅' if quiet else '❌'} No spikes flagged on {label} traffic (4h/24h: {flagged[4]}/{flagged[24]})")
+        ok = ok and quiet
+    return ok
+
+
+if __name__ == "__main__":
+    import sys
+    if '--check' in sys.argv:
+        sys.exit(0 if self_check() else 1)
+    print("Usage: python trending.py --check")